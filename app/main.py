@@ -10,11 +10,16 @@ from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Optional
 
+import anyio.to_thread
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
 from app.models.search import (
     HealthResponse,
@@ -27,6 +32,7 @@ from app.models.search import (
 from app.search.keyword import KeywordSearcher, get_searcher
 from app.search.semantic import SemanticSearcher
 from app.utils.context import extract_context
+from app.utils.normalize import get_normalizer
 
 # Load environment variables
 load_dotenv()
@@ -41,16 +47,9 @@ DEFAULT_RESULT_LIMIT = int(os.getenv("DEFAULT_RESULT_LIMIT", "20"))
 searcher: Optional[KeywordSearcher] = None
 semantic_searcher: Optional[SemanticSearcher] = None
 
-
-def get_or_init_searcher() -> Optional[KeywordSearcher]:
-    """Get or initialize the searcher."""
-    global searcher
-    if searcher is None:
-        try:
-            searcher = KeywordSearcher(INDEX_DIR)
-        except Exception as e:
-            print(f"⚠ Failed to load search index: {e}")
-    return searcher
+# Short-lived cache of search responses, keyed by normalized query + options.
+# Repeated queries skip the whole Xapian + rerank pipeline.
+search_cache: TTLCache = TTLCache(maxsize=1024, ttl=60)
 
 
 @asynccontextmanager
@@ -58,6 +57,9 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager - initialize resources on startup."""
     global searcher, semantic_searcher
 
+    # Allow more blocking search calls to run concurrently in the threadpool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = 64
+
     # Initialize keyword searcher
     try:
         searcher = KeywordSearcher(INDEX_DIR)
@@ -83,12 +85,17 @@ async def lifespan(app: FastAPI):
         print(f"⚠ Failed to load semantic search: {e}")
         semantic_searcher = None
 
+    # Expose the searchers on app.state for tests and introspection
+    app.state.searcher = searcher
+    app.state.semantic_searcher = semantic_searcher
+
     yield
 
     # Cleanup on shutdown
     if searcher is not None:
         searcher = None
     if semantic_searcher is not None:
+        semantic_searcher.save_query_cache()
         semantic_searcher = None
 
 
@@ -98,6 +105,7 @@ app = FastAPI(
     description="Search API for Marathi text corpus with keyword and semantic search capabilities",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware for frontend access
@@ -109,6 +117,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses - full-page Devanagari results run to hundreds
+# of KB of UTF-8 and compress very well
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Frontend path
 frontend_path = Path(__file__).parent.parent / "frontend"
@@ -157,57 +169,50 @@ async def health_check():
     
     Returns the status of the search service and index.
     """
-    current_searcher = get_or_init_searcher()
     return HealthResponse(
         status="ok",
-        index_loaded=current_searcher.is_loaded if current_searcher else False,
-        document_count=current_searcher.document_count if current_searcher else 0,
+        index_loaded=searcher.is_loaded if searcher else False,
+        document_count=searcher.document_count if searcher else 0,
     )
 
 
-@app.get("/api/search", response_model=SearchResponse)
-async def search(
-    query: str = Query(..., min_length=1, description="Search query in English or Devanagari"),
-    limit: int = Query(default=DEFAULT_RESULT_LIMIT, ge=1, le=100, description="Maximum results"),
-    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
-    fuzzy: bool = Query(default=True, description="Enable fuzzy matching for OCR robustness"),
-):
-    """
-    Search the Marathi text corpus.
-    
-    Performs keyword search with optional fuzzy matching using RapidFuzz
-    for handling OCR errors in scanned documents.
-    
-    - **query**: Search terms in English or Devanagari (Marathi)
-    - **limit**: Maximum number of results (1-100)
-    - **offset**: Pagination offset
-    - **fuzzy**: Enable fuzzy matching for OCR robustness (default: true)
-    """
-    # Get or initialize searcher
-    current_searcher = get_or_init_searcher()
-    
+async def _do_search(query: str, limit: int, offset: int, fuzzy: bool) -> SearchResponse:
+    """Core keyword search shared by the GET and POST endpoints."""
+    # The searcher is initialized once in lifespan
+    current_searcher = searcher
+
     if current_searcher is None or not current_searcher.is_loaded:
         raise HTTPException(
             status_code=503,
             detail="Search index not available. Please run the indexer first."
         )
-    
+
+    # Serve repeated queries from the TTL cache
+    cache_key = (get_normalizer().normalize(query), limit, offset, fuzzy)
+    cached_response = search_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
+
     try:
-        results = current_searcher.search(
-            query=query,
-            limit=limit,
-            offset=offset,
-            use_fuzzy_rerank=fuzzy,
+        # Xapian + RapidFuzz work is blocking; run it off the event loop
+        results = await run_in_threadpool(
+            current_searcher.search,
+            query,
+            limit,
+            offset,
+            fuzzy,
         )
         
-        # Convert to response model - show full page content
+        # Convert to response model - show full page content.
+        # model_construct skips validation; these fields come straight from
+        # our own indexer, not from user input.
         search_results = []
         for r in results:
             # Use full content from the indexed document
             full_content = r.get("content", r["content_preview"])
-            
+
             search_results.append(
-                SearchResult(
+                SearchResult.model_construct(
                     file_path=r["file_path"],
                     page_number=r.get("page_number"),
                     content=full_content,
@@ -217,12 +222,14 @@ async def search(
                 )
             )
         
-        return SearchResponse(
+        response = SearchResponse(
             query=query,
             total_results=len(search_results),
             results=search_results,
         )
-        
+        search_cache[cache_key] = response
+        return response
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -230,17 +237,39 @@ async def search(
         )
 
 
+@app.get("/api/search", response_model=SearchResponse)
+async def search(
+    query: str = Query(..., min_length=1, description="Search query in English or Devanagari"),
+    limit: int = Query(default=DEFAULT_RESULT_LIMIT, ge=1, le=100, description="Maximum results"),
+    offset: int = Query(default=0, ge=0, description="Offset for pagination"),
+    fuzzy: bool = Query(default=True, description="Enable fuzzy matching for OCR robustness"),
+):
+    """
+    Search the Marathi text corpus.
+
+    Performs keyword search with optional fuzzy matching using RapidFuzz
+    for handling OCR errors in scanned documents.
+
+    - **query**: Search terms in English or Devanagari (Marathi)
+    - **limit**: Maximum number of results (1-100)
+    - **offset**: Pagination offset
+    - **fuzzy**: Enable fuzzy matching for OCR robustness (default: true)
+    """
+    return await _do_search(query, limit, offset, fuzzy)
+
+
 @app.post("/api/search", response_model=SearchResponse)
 async def search_post(search_query: SearchQuery):
     """
     Search the Marathi text corpus (POST method).
-    
+
     Alternative endpoint for complex queries using POST.
     """
-    return await search(
+    return await _do_search(
         query=search_query.query,
         limit=search_query.limit,
         offset=search_query.offset,
+        fuzzy=search_query.fuzzy,
     )
 
 
@@ -255,8 +284,8 @@ async def search_exact(
     Use this endpoint when you need exact phrase matching
     instead of keyword search.
     """
-    current_searcher = get_or_init_searcher()
-    
+    current_searcher = searcher
+
     if current_searcher is None or not current_searcher.is_loaded:
         raise HTTPException(
             status_code=503,
@@ -264,10 +293,10 @@ async def search_exact(
         )
     
     try:
-        results = current_searcher.search_exact(query=query, limit=limit)
+        results = await run_in_threadpool(current_searcher.search_exact, query, limit)
         
         search_results = [
-            SearchResult(
+            SearchResult.model_construct(
                 file_path=r["file_path"],
                 page_number=r.get("page_number"),
                 content=r["content_preview"],
@@ -334,7 +363,7 @@ async def semantic_search(
         )
 
     try:
-        result = semantic_searcher.search(
+        result = await semantic_searcher.asearch(
             query=query,
             limit=limit,
             include_summary=summarize
@@ -359,6 +388,51 @@ async def semantic_search(
         )
 
 
+def _sse_event(event: str, payload: dict) -> bytes:
+    """Format one server-sent event frame (payload JSON-escaped to one line)."""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+
+@app.get("/api/semantic/search/stream")
+async def semantic_search_stream(
+    query: str = Query(..., min_length=1, description="Search query in English or Marathi"),
+    limit: int = Query(20, ge=1, le=100, description="Number of results (1-100)")
+):
+    """
+    Semantic search with the summary streamed as server-sent events.
+
+    Emits a `results` event with the ranked hits as soon as the vector
+    search finishes, `summary` events carrying text deltas as Gemini
+    generates them, and a final `done` event - so the UI can render
+    results and summary tokens without waiting for the full generation.
+
+    - **query**: Search query in English or Marathi
+    - **limit**: Maximum number of results (1-100, default: 20)
+    """
+    if semantic_searcher is None or not semantic_searcher.is_loaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Semantic search not available. ChromaDB not loaded."
+        )
+
+    current_searcher = semantic_searcher
+
+    async def event_stream():
+        try:
+            async for event, payload in current_searcher.astream_search(query, limit):
+                yield _sse_event(event, payload)
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Semantic search failed: {str(e)}"})
+            return
+        yield _sse_event("done", {})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
 @app.get("/api/reload")
 async def reload_index():
     """
@@ -367,13 +441,14 @@ async def reload_index():
     Call this endpoint after re-indexing the corpus
     to pick up the new documents.
     """
-    current_searcher = get_or_init_searcher()
+    current_searcher = searcher
 
     if current_searcher is None:
         raise HTTPException(status_code=503, detail="Searcher not initialized")
 
     try:
         current_searcher.reload_index()
+        search_cache.clear()
         return {
             "status": "ok",
             "message": "Index reloaded",
@@ -389,6 +464,15 @@ if __name__ == "__main__":
     
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
-    
-    uvicorn.run(app, host=host, port=port)
+
+    # uvicorn[standard] ships uvloop and httptools; request them explicitly
+    # so the C-accelerated event loop and HTTP parser are always used.
+    uvicorn.run(
+        app,
+        host=host,
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+    )
 
@@ -2,6 +2,15 @@
 
 from pydantic import BaseModel, Field
 
+__all__ = [
+    "SearchQuery",
+    "SearchResult",
+    "SearchResponse",
+    "HealthResponse",
+    "SemanticSearchResult",
+    "SemanticSearchResponse",
+]
+
 
 class SearchQuery(BaseModel):
     """Search query input model."""
@@ -9,6 +18,7 @@ class SearchQuery(BaseModel):
     query: str = Field(..., min_length=1, description="Search query in English or Devanagari")
     limit: int = Field(default=20, ge=1, le=100, description="Maximum number of results")
     offset: int = Field(default=0, ge=0, description="Offset for pagination")
+    fuzzy: bool = Field(default=True, description="Enable fuzzy matching for OCR robustness")
 
 
 class SearchResult(BaseModel):
@@ -5,14 +5,68 @@ This module provides fast keyword search with fuzzy matching capabilities
 to handle OCR errors in the Marathi text corpus.
 """
 
-import json
+import re
+import struct
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
+import numpy as np
 import xapian
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+
+from app.utils.context import read_file_lines
+from app.utils.normalize import MarathiNormalizer, get_normalizer, normalize_text
+
+# Value slots written by scripts/index_corpus.py
+SLOT_FILE_PATH = 0
+SLOT_CONTENT_PREVIEW = 2
+
+# Version byte and fixed header of the struct-packed document data; the
+# UTF-8 file path follows. Must match scripts/index_corpus.py
+_META_VERSION = b'\x01'
+_META_HEADER = struct.Struct('<IiI')  # doc_id, page_number (-1 = none), char_count
+
+
+def _parse_doc_data(raw: bytes) -> dict:
+    """
+    Decode the document data written by scripts/index_corpus.py.
+
+    Current indexes lead with a version byte (never '{'), then a struct
+    header and the file path; anything else is a JSON blob from an older
+    index (which also carried the full content). Both shapes come back
+    as a dict.
+    """
+    if raw[:1] != _META_VERSION:
+        return orjson.loads(raw)
+    doc_id, page_number, char_count = _META_HEADER.unpack_from(raw, 1)
+    return {
+        "file_path": raw[1 + _META_HEADER.size:].decode('utf-8'),
+        "page_number": None if page_number < 0 else page_number,
+        "char_count": char_count,
+        "doc_id": doc_id,
+    }
 
-from app.utils.normalize import MarathiNormalizer, get_normalizer
+
+def _full_content(file_path: str) -> str:
+    """
+    Full page text for a result, re-read from the corpus file.
+
+    Newer indexes keep only metadata in the document data; the content
+    itself lives in the corpus file and comes back through the
+    mmap-backed cache in app.utils.context.
+    """
+    if not file_path:
+        return ""
+    return "\n".join(read_file_lines(Path(file_path)))
+
+
+@lru_cache(maxsize=256)
+def _highlight_pattern(terms: tuple[str, ...]) -> re.Pattern:
+    """Compile a single case-insensitive alternation for the query terms."""
+    return re.compile("|".join(map(re.escape, terms)), re.IGNORECASE)
 
 
 class KeywordSearcher:
@@ -26,40 +80,113 @@ class KeywordSearcher:
     - Support for both English and Devanagari queries
     """
     
+    # Query parser flags: partial/wildcard matching for keyword queries,
+    # phrase matching for exact search
+    QUERY_FLAGS = (
+        xapian.QueryParser.FLAG_DEFAULT |
+        xapian.QueryParser.FLAG_PARTIAL |
+        xapian.QueryParser.FLAG_WILDCARD
+    )
+    PHRASE_FLAGS = xapian.QueryParser.FLAG_PHRASE
+
+    # Fuzzy scores below this are reported as 0; lets RapidFuzz abort the
+    # alignment early on clearly irrelevant previews
+    FUZZY_SCORE_CUTOFF = 50
+
+    # Hard cap on preview length; partial_ratio cost is O(|query|*|preview|)
+    MAX_PREVIEW_CHARS = 512
+
     def __init__(self, index_path: str | Path):
         """
         Initialize the searcher with a Xapian index.
-        
+
         Args:
             index_path: Path to the Xapian index directory
         """
         self.index_path = Path(index_path)
         self.xapian_db_path = self.index_path / "xapian_db"
-        
+
         self._db: Optional[xapian.Database] = None
+        self._qp: Optional[xapian.QueryParser] = None
+        self._qp_exact: Optional[xapian.QueryParser] = None
         self._normalizer = get_normalizer()
-        
+
         # Scoring weights
         self.xapian_weight = 0.7
         self.fuzzy_weight = 0.3
     
     @property
     def db(self) -> xapian.Database:
-        """Lazy-load the Xapian database."""
+        """
+        Lazy-load the Xapian database.
+
+        A sharded index (built with index_corpus.py --shards N) is listed
+        in manifest.json; its sub-databases are stitched into one virtual
+        Database with add_database. Without a manifest the single DB
+        directory is opened directly.
+        """
         if self._db is None:
-            if not self.xapian_db_path.exists():
-                raise FileNotFoundError(
-                    f"Xapian index not found at {self.xapian_db_path}. "
-                    "Run scripts/index_corpus.py first."
-                )
-            self._db = xapian.Database(str(self.xapian_db_path))
+            shards = self._manifest_shards()
+            if shards:
+                db = xapian.Database()
+                for shard in shards:
+                    db.add_database(xapian.Database(str(self.index_path / shard)))
+                self._db = db
+            else:
+                if not self.xapian_db_path.exists():
+                    raise FileNotFoundError(
+                        f"Xapian index not found at {self.xapian_db_path}. "
+                        "Run scripts/index_corpus.py first."
+                    )
+                self._db = xapian.Database(str(self.xapian_db_path))
         return self._db
+
+    def _manifest_shards(self) -> list[str]:
+        """Shard directory names from manifest.json, or [] if absent."""
+        manifest_path = self.index_path / "manifest.json"
+        try:
+            return orjson.loads(manifest_path.read_bytes()).get("shards", [])
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return []
     
+    @property
+    def query_parser(self) -> xapian.QueryParser:
+        """Lazy-build the reusable query parser for keyword search."""
+        if self._qp is None:
+            qp = xapian.QueryParser()
+            qp.set_database(self.db)
+            qp.set_stemmer(xapian.Stem("none"))  # No stemming for Marathi
+            self._qp = qp
+        return self._qp
+
+    @property
+    def exact_query_parser(self) -> xapian.QueryParser:
+        """Lazy-build the reusable query parser for exact phrase search."""
+        if self._qp_exact is None:
+            qp = xapian.QueryParser()
+            qp.set_database(self.db)
+            self._qp_exact = qp
+        return self._qp_exact
+
+    def _make_enquire(self) -> xapian.Enquire:
+        """
+        Create an Enquire with BM25 weighting and relaxed docid ordering.
+
+        DONT_CARE docid order plus BM25 lets Xapian apply WAND-style early
+        termination during get_mset instead of walking posting lists fully.
+        """
+        enquire = xapian.Enquire(self.db)
+        enquire.set_weighting_scheme(xapian.BM25Weight(1.2, 0, 1, 0.75, 0.5))
+        enquire.set_docid_order(xapian.Enquire.DONT_CARE)
+        return enquire
+
     def reload_index(self) -> None:
         """Reload the Xapian index (useful after re-indexing)."""
         if self._db is not None:
             self._db.close()
             self._db = None
+        self._qp = None
+        self._qp_exact = None
         # Re-open on next access
     
     @property
@@ -101,93 +228,124 @@ class KeywordSearcher:
         if not query or not query.strip():
             return []
         
-        # Normalize the query
-        normalized_query = self._normalizer.normalize(query)
-        
-        # Set up query parser
-        qp = xapian.QueryParser()
-        qp.set_database(self.db)
-        qp.set_stemmer(xapian.Stem("none"))  # No stemming for Marathi
-        
+        # Normalize the query (cached - repeated queries skip the pipeline)
+        normalized_query = normalize_text(query)
+
         # Parse the query with automatic wildcards for partial matching
-        # FLAG_PARTIAL allows prefix matching
-        flags = (
-            xapian.QueryParser.FLAG_DEFAULT |
-            xapian.QueryParser.FLAG_PARTIAL |
-            xapian.QueryParser.FLAG_WILDCARD
-        )
-        
+        # (FLAG_PARTIAL allows prefix matching)
+        qp = self.query_parser
+
         try:
-            xapian_query = qp.parse_query(normalized_query, flags)
+            xapian_query = qp.parse_query(normalized_query, self.QUERY_FLAGS)
         except xapian.QueryParserError:
             # Fallback to simple query if parsing fails
             xapian_query = qp.parse_query(normalized_query)
         
         # Execute the search
-        enquire = xapian.Enquire(self.db)
+        enquire = self._make_enquire()
         enquire.set_query(xapian_query)
-        
-        # Get extra results for reranking if fuzzy is enabled
+
+        # Collapse on the file-path value slot so near-duplicate hits from
+        # the same page don't crowd the rerank candidate pool
+        enquire.set_collapse_key(SLOT_FILE_PATH)
+
+        # Get extra results for reranking if fuzzy is enabled. No
+        # checkatleast argument: values up to first + maxitems are a no-op
+        # and larger ones force extra checking, reducing pruning.
+        # fetch() batch-loads document data instead of many lazy reads.
         fetch_limit = limit * 3 if use_fuzzy_rerank else limit
         matches = enquire.get_mset(0, fetch_limit + offset)
-        
-        # Process results
-        results = []
+        matches.fetch()
+
+        # With fewer candidates than the page size, reranking can't change
+        # which documents are returned - skip the fuzzy scoring entirely
+        if use_fuzzy_rerank and matches.size() <= limit:
+            use_fuzzy_rerank = False
+
+        # First pass: collect candidates and previews. The preview comes from
+        # a raw value slot, so no JSON is parsed for candidates that never
+        # make it past the rerank. Indexes built before the slot existed fall
+        # back to parsing the document data.
+        max_weight = matches.get_max_possible() or 1
+        candidates = []
+        previews = []
+        raw_weights = []
         for match in matches:
             try:
-                # Parse document data
-                doc_data = match.document.get_data()
-                if isinstance(doc_data, bytes):
-                    doc_data = doc_data.decode('utf-8')
-                
-                data = json.loads(doc_data)
-                
-                # Get content for fuzzy matching
-                content = data.get("content", "")
-                content_preview = data.get("content_preview", content[:500])
-                
-                # Calculate Xapian score (normalize to 0-100 range)
-                xapian_score = match.weight
-                max_weight = matches.get_max_possible() or 1
-                xapian_score_normalized = (xapian_score / max_weight) * 100
-                
-                # Calculate fuzzy score if enabled
-                if use_fuzzy_rerank:
-                    # Use partial_ratio for substring matching
-                    fuzzy_score = fuzz.partial_ratio(query, content_preview)
-                else:
-                    fuzzy_score = 0
-                
-                # Calculate combined score
-                if use_fuzzy_rerank:
-                    combined_score = (
-                        xapian_score_normalized * self.xapian_weight +
-                        fuzzy_score * self.fuzzy_weight
-                    )
-                else:
-                    combined_score = xapian_score_normalized
-                
-                results.append({
-                    "file_path": data.get("file_path", ""),
-                    "page_number": data.get("page_number"),
-                    "content": content,
-                    "content_preview": content_preview,
-                    "xapian_score": round(xapian_score_normalized, 2),
-                    "fuzzy_score": round(fuzzy_score, 2),
-                    "combined_score": round(combined_score, 2),
-                    "doc_id": match.docid
-                })
-                
-            except (json.JSONDecodeError, KeyError, AttributeError) as e:
+                document = match.document
+                data = None
+                content_preview = document.get_value(SLOT_CONTENT_PREVIEW).decode('utf-8')
+                if not content_preview:
+                    data = _parse_doc_data(document.get_data())
+                    content_preview = data.get("content_preview") or data.get("content", "")
+                # Bound per-candidate fuzzy-scoring cost regardless of what
+                # the indexer stored
+                content_preview = content_preview[:self.MAX_PREVIEW_CHARS]
+
+                candidates.append((document, data, match.docid))
+                previews.append(content_preview)
+                raw_weights.append(match.weight)
+
+            except (orjson.JSONDecodeError, struct.error, KeyError, AttributeError) as e:
                 # Skip malformed documents
                 continue
-        
-        # Sort by combined score if fuzzy reranking is enabled
+
+        if not candidates:
+            return []
+
+        # Normalize Xapian scores to 0-100 range
+        n = len(candidates)
+        xapian_scores = np.fromiter(raw_weights, dtype=np.float32, count=n)
+        xapian_scores *= 100.0 / max_weight
+
         if use_fuzzy_rerank:
-            results.sort(key=lambda x: x["combined_score"], reverse=True)
-        
-        # Apply pagination
-        return results[offset:offset + limit]
+            # Batch-score all previews in RapidFuzz's C++ core, using all cores
+            fuzzy_scores = process.cdist(
+                [query], previews,
+                scorer=fuzz.partial_ratio,
+                score_cutoff=self.FUZZY_SCORE_CUTOFF,
+                workers=-1,
+            )[0].astype(np.float32)
+            combined_scores = (
+                xapian_scores * self.xapian_weight +
+                fuzzy_scores * self.fuzzy_weight
+            )
+            # Select the requested page with a partial partition, then sort
+            # only those top-k entries instead of the whole candidate pool
+            k = min(offset + limit, n)
+            top = np.argpartition(-combined_scores, k - 1)[:k]
+            order = top[np.argsort(-combined_scores[top])]
+        else:
+            fuzzy_scores = np.zeros(n, dtype=np.float32)
+            combined_scores = xapian_scores
+            order = np.arange(n)
+
+        # Second pass: parse document data and build full result dicts only
+        # for the requested page
+        results = []
+        for i in order[offset:offset + limit]:
+            document, data, docid = candidates[i]
+            try:
+                if data is None:
+                    data = _parse_doc_data(document.get_data())
+            except (orjson.JSONDecodeError, struct.error):
+                continue
+            # Legacy indexes embedded the content; current ones re-read it
+            content = data.get("content")
+            if content is None:
+                content = _full_content(data.get("file_path", ""))
+            results.append({
+                "file_path": data.get("file_path", ""),
+                "page_number": data.get("page_number"),
+                "content": content,
+                "content_preview": previews[i],
+                "xapian_score": round(float(xapian_scores[i]), 2),
+                "fuzzy_score": round(float(fuzzy_scores[i]), 2),
+                "combined_score": round(float(combined_scores[i]), 2),
+                "doc_id": docid
+            })
+
+        return results
     
     def search_exact(self, query: str, limit: int = 20) -> list[dict]:
         """
@@ -203,38 +361,42 @@ class KeywordSearcher:
         if not query or not query.strip():
             return []
         
-        normalized_query = self._normalizer.normalize(query)
-        
-        # Create a phrase query
-        qp = xapian.QueryParser()
-        qp.set_database(self.db)
-        
-        # Use phrase query for exact matching
-        flags = xapian.QueryParser.FLAG_PHRASE
-        
+        normalized_query = normalize_text(query)
+
+        # Use a phrase query for exact matching
         try:
-            xapian_query = qp.parse_query(f'"{normalized_query}"', flags)
+            xapian_query = self.exact_query_parser.parse_query(
+                f'"{normalized_query}"', self.PHRASE_FLAGS
+            )
         except xapian.QueryParserError:
             return []
         
-        enquire = xapian.Enquire(self.db)
+        enquire = self._make_enquire()
         enquire.set_query(xapian_query)
         matches = enquire.get_mset(0, limit)
+        matches.fetch()
         
         results = []
         for match in matches:
             try:
-                doc_data = match.document.get_data()
-                if isinstance(doc_data, bytes):
-                    doc_data = doc_data.decode('utf-8')
-                
-                data = json.loads(doc_data)
-                
+                document = match.document
+                data = _parse_doc_data(document.get_data())
+
+                # Preview from its value slot; older indexes kept it in the
+                # JSON blob instead
+                preview = document.get_value(SLOT_CONTENT_PREVIEW).decode('utf-8')
+                if not preview:
+                    preview = data.get("content_preview") or data.get("content", "")
+
+                content = data.get("content")
+                if content is None:
+                    content = _full_content(data.get("file_path", ""))
+
                 results.append({
                     "file_path": data.get("file_path", ""),
                     "page_number": data.get("page_number"),
-                    "content": data.get("content", ""),
-                    "content_preview": data.get("content_preview", ""),
+                    "content": content,
+                    "content_preview": preview[:self.MAX_PREVIEW_CHARS],
                     "xapian_score": round(match.weight, 2),
                     "fuzzy_score": 100.0,  # Exact match
                     "combined_score": round(match.weight, 2),
@@ -267,21 +429,16 @@ class KeywordSearcher:
         if not text or not query:
             return text
         
-        # Normalize query and split into terms
+        # Normalize query and split into terms, skipping very short ones
         normalized_query = self._normalizer.normalize(query)
-        terms = normalized_query.split()
-        
-        result = text
-        for term in terms:
-            if len(term) < 2:  # Skip very short terms
-                continue
-            
-            # Case-insensitive replacement
-            import re
-            pattern = re.compile(re.escape(term), re.IGNORECASE)
-            result = pattern.sub(f"{before_tag}\\g<0>{after_tag}", result)
-        
-        return result
+        terms = tuple(t for t in normalized_query.split() if len(t) >= 2)
+
+        if not terms:
+            return text
+
+        # Single pass over the text with one compiled alternation
+        pattern = _highlight_pattern(terms)
+        return pattern.sub(f"{before_tag}\\g<0>{after_tag}", text)
 
 
 # Singleton instance
@@ -5,14 +5,96 @@ This module provides AI-powered semantic search with bilingual source references
 for the Marathi history corpus.
 """
 
+import asyncio
+import json
 import os
+import pickle
 import requests
+from collections import OrderedDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple
 
 import chromadb
+import httpx
+import numpy as np
 from chromadb.config import Settings
 
+# Try to import SimSIMD for SIMD-accelerated similarity, with BLAS fallback
+try:
+    import simsimd
+    SIMSIMD_AVAILABLE = True
+except ImportError:
+    SIMSIMD_AVAILABLE = False
+
+
+# Fixed pieces of the summary prompt, assembled around the query and the
+# retrieved contexts at call time
+_PROMPT_HEAD = """You are a historian analyzing historical documents about Marathi history (मराठा इतिहास).
+
+Based on the following retrieved document excerpts, provide a comprehensive and coherent summary answering the user's query.
+
+**Instructions:**
+1. Organize the information chronologically by dates/events when possible
+2. Include specific dates, names, and places mentioned in the sources
+3. Some information in the context will be in quotes or a part of a letter. In the output summary
+mention that this information is from a letter of quote by the author or speaker.
+4. If there are contradictions or uncertainties, note them
+5. Write in clear, flowing prose (not bullet points)
+6. If the context doesn't contain relevant information for the query, say so honestly
+7. Focus on accuracy - only include information found in the provided context
+8. If there are interesting factoids or trivia, include them in the output.
+9. If there is no matching information in the context, say so honestly and do not use any
+other external knowledge to answer the query.
+
+**User Query:** """
+
+_PROMPT_MID = "\n\n**Retrieved Historical Documents:**\n"
+
+_PROMPT_TAIL = "\n\n**Summary (organized chronologically when dates are available):**"
+
+_CONTEXT_SEP = "\n\n---\n\n"
+
+
+# Shared async HTTP client for Gemini calls. HTTP/2 multiplexes the
+# embedding and summary requests over one pooled TLS connection.
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get the shared httpx.AsyncClient, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+        )
+    return _async_client
+
+
+# Shared sync session for the CLI/script paths: keep-alive instead of a
+# fresh TCP+TLS handshake per Gemini call, plus retry on transient errors
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Get the shared requests.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ))
+        _session = session
+    return _session
+
 
 class SemanticSearcher:
     """
@@ -31,6 +113,23 @@ class SemanticSearcher:
     TASK_TYPE = "RETRIEVAL_QUERY"
     DIMENSION = 768
 
+    # Query cache: exact-match embeddings plus a semantic tier that reuses
+    # full results for near-identical queries
+    QUERY_CACHE_SIZE = 256
+    QUERY_CACHE_THRESHOLD = 0.97
+    QUERY_CACHE_FILE = "query_cache.pkl"
+    # Bump when the pickled cache layout changes; older files are ignored
+    QUERY_CACHE_VERSION = 2
+
+    # On-disk cache of the in-process corpus matrix, rebuilt from ChromaDB
+    # when missing
+    MATRIX_CACHE_FILE = "corpus_matrix.pkl"
+
+    # Coalescing window for async embedding calls: concurrent queries that
+    # arrive within the window share one batchEmbedContents request
+    EMBED_BATCH_SIZE = 100
+    EMBED_BATCH_WINDOW = 0.02
+
     def __init__(self, vectors_dir: Path, collection_name: str = "marathi_history"):
         """
         Initialize the semantic searcher with ChromaDB.
@@ -46,6 +145,25 @@ class SemanticSearcher:
         self._collection: Optional[chromadb.Collection] = None
         self._api_key: Optional[str] = None
 
+        # In-process copy of the corpus vectors (L2-normalized) with
+        # parallel id/metadata/document lists, loaded on first query
+        self._X: Optional[np.ndarray] = None
+        self._chunk_ids: List[str] = []
+        self._metas: List[Dict] = []
+        self._docs: List[str] = []
+
+        # Tier 1: exact query text -> embedding (LRU)
+        self._embedding_cache: OrderedDict[str, List[float]] = OrderedDict()
+        # Tier 2: normalized embeddings of past queries + their full results
+        self._q_matrix: Optional[np.ndarray] = None
+        self._q_results: List[Dict] = []
+        self._load_query_cache()
+
+        # Embedding batcher: queue of (query, future) pairs drained by a
+        # background task, started lazily on the first async embed
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_worker: Optional[asyncio.Task] = None
+
     @property
     def api_key(self) -> str:
         """Lazy-load API key from environment."""
@@ -93,10 +211,131 @@ class SemanticSearcher:
         except Exception:
             return False
 
+    def _load_query_cache(self) -> None:
+        """Best-effort restore of the query cache persisted on shutdown."""
+        cache_path = self.vectors_dir / self.QUERY_CACHE_FILE
+        try:
+            with open(cache_path, 'rb') as f:
+                saved = pickle.load(f)
+            if saved.get("version") != self.QUERY_CACHE_VERSION:
+                return
+            self._embedding_cache = saved["embeddings"]
+            self._q_matrix = saved["matrix"]
+            self._q_results = saved["results"]
+        except Exception:
+            pass
+
+    def save_query_cache(self) -> None:
+        """Persist the query cache so restarts keep their warm state."""
+        cache_path = self.vectors_dir / self.QUERY_CACHE_FILE
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump({
+                    "version": self.QUERY_CACHE_VERSION,
+                    "embeddings": self._embedding_cache,
+                    "matrix": self._q_matrix,
+                    "results": self._q_results,
+                }, f)
+        except Exception:
+            pass
+
+    def _lookup_similar_query(
+        self,
+        embedding: List[float],
+        limit: int,
+        include_summary: bool
+    ) -> Optional[Dict]:
+        """Return a cached result if a near-identical query was seen before."""
+        if self._q_matrix is None or not self._q_results:
+            return None
+
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return None
+
+        # Single BLAS gemv against all cached query embeddings
+        sims = self._q_matrix @ (vec / norm)
+        best = int(np.argmax(sims))
+        if sims[best] < self.QUERY_CACHE_THRESHOLD:
+            return None
+
+        cached_limit, cached = self._q_results[best]
+        if cached_limit != limit:
+            # Cached under a different result count; replaying it would
+            # return the wrong page size
+            return None
+        if include_summary and cached.get("summary") is None:
+            # Cached under summarize=False; the summary still needs generating
+            return None
+
+        result = dict(cached)
+        if not include_summary:
+            result["summary"] = None
+        return result
+
+    def _remember_query(self, embedding: List[float], limit: int, result: Dict) -> None:
+        """Add a query embedding + result to the semantic cache (bounded)."""
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm == 0:
+            return
+        vec = vec / norm
+
+        if self._q_matrix is None:
+            self._q_matrix = vec[None, :]
+        else:
+            self._q_matrix = np.vstack([self._q_matrix, vec])
+        self._q_results.append((limit, result))
+
+        # Evict oldest entries beyond the cache bound
+        if len(self._q_results) > self.QUERY_CACHE_SIZE:
+            overflow = len(self._q_results) - self.QUERY_CACHE_SIZE
+            self._q_matrix = self._q_matrix[overflow:]
+            del self._q_results[:overflow]
+
+    def _embed_request(self, query: str) -> Tuple[str, Dict]:
+        """Build the URL and body for an embedContent call."""
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.EMBEDDING_MODEL}:embedContent?key={self.api_key}"
+
+        body = {
+            "model": f"models/{self.EMBEDDING_MODEL}",
+            "content": {
+                "parts": [{"text": query}]
+            },
+            "taskType": self.TASK_TYPE,
+            "outputDimensionality": self.DIMENSION
+        }
+        return url, body
+
+    def _cache_embedding(self, query: str, result: Dict) -> List[float]:
+        """Extract the embedding from an API response and cache it."""
+        embedding = result.get("embedding", {}).get("values", [])
+
+        if not embedding:
+            raise Exception("No embedding returned from API")
+
+        self._embedding_cache[query] = embedding
+        if len(self._embedding_cache) > self.QUERY_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
+        return embedding
+
+    def _cached_embedding(self, query: str) -> Optional[List[float]]:
+        """Return the cached embedding for an exact query text, if any."""
+        cached = self._embedding_cache.get(query)
+        if cached is not None:
+            self._embedding_cache.move_to_end(query)
+        return cached
+
     def embed_query(self, query: str) -> List[float]:
         """
         Generate embedding for a search query using Gemini API.
 
+        Identical query texts are served from an in-process LRU cache
+        instead of paying the Gemini round-trip again.
+
         Args:
             query: Search query text
 
@@ -106,29 +345,93 @@ class SemanticSearcher:
         Raises:
             Exception: If embedding generation fails
         """
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.EMBEDDING_MODEL}:embedContent?key={self.api_key}"
-
-        body = {
-            "model": f"models/{self.EMBEDDING_MODEL}",
-            "content": {
-                "parts": [{"text": query}]
-            },
-            "taskType": self.TASK_TYPE,
-            "outputDimensionality": self.DIMENSION
-        }
+        cached = self._cached_embedding(query)
+        if cached is not None:
+            return cached
 
-        resp = requests.post(url, json=body, timeout=30)
+        url, body = self._embed_request(query)
+        resp = get_session().post(url, json=body, timeout=30)
 
         if resp.status_code != 200:
             raise Exception(f"Embedding API error: {resp.text}")
 
-        result = resp.json()
-        embedding = result.get("embedding", {}).get("values", [])
+        return self._cache_embedding(query, resp.json())
 
-        if not embedding:
-            raise Exception("No embedding returned from API")
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Async variant of embed_query.
 
-        return embedding
+        Concurrent callers are coalesced by a background collector into a
+        single batchEmbedContents request (up to EMBED_BATCH_SIZE texts or
+        EMBED_BATCH_WINDOW seconds per batch), so a burst of queries costs
+        one HTTP round-trip instead of one each.
+        """
+        cached = self._cached_embedding(query)
+        if cached is not None:
+            return cached
+
+        if self._embed_queue is None:
+            self._embed_queue = asyncio.Queue()
+            self._embed_worker = asyncio.get_running_loop().create_task(
+                self._embed_batch_worker()
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._embed_queue.put_nowait((query, future))
+        return await future
+
+    async def _collect_embed_batch(self) -> Dict[str, List[asyncio.Future]]:
+        """Gather queued embed requests, deduplicated by query text."""
+        query, future = await self._embed_queue.get()
+        batch: Dict[str, List[asyncio.Future]] = {query: [future]}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.EMBED_BATCH_WINDOW
+        while len(batch) < self.EMBED_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                query, future = await asyncio.wait_for(self._embed_queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            batch.setdefault(query, []).append(future)
+
+        return batch
+
+    async def _embed_batch_worker(self) -> None:
+        """Drain the embed queue, one batchEmbedContents call per batch."""
+        while True:
+            batch = await self._collect_embed_batch()
+            queries = list(batch)
+
+            try:
+                url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.EMBEDDING_MODEL}:batchEmbedContents?key={self.api_key}"
+                body = {"requests": [self._embed_request(q)[1] for q in queries]}
+                resp = await get_async_client().post(url, json=body, timeout=30)
+
+                if resp.status_code != 200:
+                    raise Exception(f"Embedding API error: {resp.text}")
+
+                embeddings = resp.json().get("embeddings", [])
+                if len(embeddings) != len(queries):
+                    raise Exception("Embedding API returned a partial batch")
+
+                results = [
+                    self._cache_embedding(q, {"embedding": entry})
+                    for q, entry in zip(queries, embeddings)
+                ]
+            except Exception as e:
+                for futures in batch.values():
+                    for f in futures:
+                        if not f.done():
+                            f.set_exception(e)
+                continue
+
+            for q, embedding in zip(queries, results):
+                for f in batch[q]:
+                    if not f.done():
+                        f.set_result(embedding)
 
     def search(
         self,
@@ -161,28 +464,271 @@ class SemanticSearcher:
         except Exception as e:
             raise Exception(f"Failed to generate query embedding: {str(e)}")
 
+        # Near-identical queries reuse the full cached result, skipping the
+        # vector search and summary generation entirely
+        cached = self._lookup_similar_query(query_embedding, limit, include_summary)
+        if cached is not None:
+            cached["query"] = query
+            return cached
+
         # Query ChromaDB
-        results_data = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(limit, 100),
-            include=["metadatas", "documents", "distances"]
+        results, context_texts = self._query_collection(
+            query_embedding, limit, include_summary
         )
 
+        # Generate summary if requested
+        summary = None
+        summary_failed = False
+        if include_summary and context_texts:
+            try:
+                summary = self.generate_summary(query, context_texts)
+            except Exception as e:
+                summary = f"Error generating summary: {str(e)[:200]}"
+                summary_failed = True
+
+        response = {
+            "query": query,
+            "results": results,
+            "total": len(results),
+            "summary": summary
+        }
+        # A failed summary is returned but never cached: the cache has no
+        # TTL, so a transient API outage must not stick to the query
+        if not summary_failed:
+            self._remember_query(query_embedding, limit, response)
+        return response
+
+    async def asearch(
+        self,
+        query: str,
+        limit: int = 20,
+        include_summary: bool = True
+    ) -> Dict:
+        """
+        Async variant of search for use inside FastAPI handlers.
+
+        The Gemini embedding and summary calls are awaited on the shared
+        httpx client instead of blocking the event loop.
+        """
+        if not query or not query.strip():
+            return {
+                "query": query,
+                "results": [],
+                "total": 0,
+                "summary": None
+            }
+
+        try:
+            query_embedding = await self.aembed_query(query)
+        except Exception as e:
+            raise Exception(f"Failed to generate query embedding: {str(e)}")
+
+        cached = self._lookup_similar_query(query_embedding, limit, include_summary)
+        if cached is not None:
+            cached["query"] = query
+            return cached
+
+        results, context_texts = self._query_collection(
+            query_embedding, limit, include_summary
+        )
+
+        summary = None
+        summary_failed = False
+        if include_summary and context_texts:
+            try:
+                summary = await self.agenerate_summary(query, context_texts)
+            except Exception as e:
+                summary = f"Error generating summary: {str(e)[:200]}"
+                summary_failed = True
+
+        response = {
+            "query": query,
+            "results": results,
+            "total": len(results),
+            "summary": summary
+        }
+        # A failed summary is returned but never cached: the cache has no
+        # TTL, so a transient API outage must not stick to the query
+        if not summary_failed:
+            self._remember_query(query_embedding, limit, response)
+        return response
+
+    async def astream_search(
+        self,
+        query: str,
+        limit: int = 20
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """
+        Streaming variant of asearch: results first, then summary deltas.
+
+        Yields ("results", {...}) as soon as the vector search finishes,
+        then one ("summary", {"text": ...}) per fragment Gemini returns,
+        so callers can render the hits and the summary incrementally
+        instead of waiting for the full generation. Cache hits are served
+        whole; streamed summaries are not written back to the cache, since
+        astream_summary reports failures inline rather than raising.
+
+        Args:
+            query: Search query (English or Marathi)
+            limit: Maximum number of results to return (1-100)
+
+        Yields:
+            (event, payload) tuples
+        """
+        if not query or not query.strip():
+            yield "results", {"query": query, "results": [], "total": 0}
+            return
+
+        try:
+            query_embedding = await self.aembed_query(query)
+        except Exception as e:
+            raise Exception(f"Failed to generate query embedding: {str(e)}")
+
+        cached = self._lookup_similar_query(query_embedding, limit, True)
+        if cached is not None:
+            yield "results", {
+                "query": query,
+                "results": cached["results"],
+                "total": cached["total"]
+            }
+            if cached.get("summary"):
+                yield "summary", {"text": cached["summary"]}
+            return
+
+        results, context_texts = self._query_collection(query_embedding, limit, True)
+        yield "results", {"query": query, "results": results, "total": len(results)}
+
+        if context_texts:
+            async for piece in self.astream_summary(query, context_texts):
+                yield "summary", {"text": piece}
+
+    def _ensure_matrix(self) -> None:
+        """
+        Load the corpus vectors into an in-process matrix, once.
+
+        The corpus is only thousands of 768-dim vectors, so a single
+        normalized float32 matrix scored with one matmul beats dispatching
+        through ChromaDB's SQLite + HNSW stack per query. A pickle of the
+        matrix and parallel lists makes reloads instant; on a cache miss
+        everything is dumped from the ChromaDB collection.
+        """
+        if self._X is not None:
+            return
+
+        cache_path = self.vectors_dir / self.MATRIX_CACHE_FILE
+        try:
+            with open(cache_path, 'rb') as f:
+                saved = pickle.load(f)
+            self._chunk_ids = saved["ids"]
+            self._metas = saved["metas"]
+            self._docs = saved["docs"]
+            self._X = self._finalize_matrix(saved["matrix"])
+            return
+        except Exception:
+            pass
+
+        data = self.collection.get(include=["embeddings", "metadatas", "documents"])
+
+        # An empty collection dumps as [], which np.asarray leaves 1-D and
+        # the axis-1 normalization below would reject; _query_collection
+        # already returns an empty result for a corpus with no vectors
+        if not data["ids"]:
+            self._chunk_ids = []
+            self._metas = []
+            self._docs = []
+            self._X = self._finalize_matrix(np.empty((0, 0), dtype=np.float32))
+            return
+
+        X = np.asarray(data["embeddings"], dtype=np.float32)
+        norms = np.linalg.norm(X, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        X /= norms
+
+        self._chunk_ids = data["ids"]
+        self._metas = data["metadatas"]
+        self._docs = data["documents"]
+        self._X = self._finalize_matrix(X)
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump({
+                    "ids": self._chunk_ids,
+                    "metas": self._metas,
+                    "docs": self._docs,
+                    # Persist full precision; quantization happens on load
+                    "matrix": X,
+                }, f)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _finalize_matrix(X: np.ndarray) -> np.ndarray:
+        """
+        Pick the in-memory representation for the corpus matrix.
+
+        Scoring is memory-bound, so FP16 halves the bytes streamed per query
+        when SimSIMD's half-precision kernels are available. The NumPy
+        fallback keeps float32, where fp16 matmul would be slower.
+        """
+        if SIMSIMD_AVAILABLE:
+            return np.ascontiguousarray(X, dtype=np.float16)
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def _query_collection(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        include_summary: bool
+    ) -> Tuple[List[Dict], List[str]]:
+        """Score the query against the in-process matrix and build results."""
+        self._ensure_matrix()
+
+        # Empty collection: nothing to score (a 0-row matmul would raise)
+        if not self._chunk_ids:
+            return [], []
+
+        q = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(q)
+        if norm > 0:
+            q = q / norm
+
+        # Score the whole corpus in one pass, then a partial top-k select.
+        # SimSIMD's cosine kernel uses AVX-512/NEON and beats the BLAS gemv
+        # on this memory-bound workload; vectors are normalized, so
+        # similarity is 1 - cosine distance.
+        if SIMSIMD_AVAILABLE:
+            distances = np.asarray(
+                simsimd.cdist(self._X, q[None, :].astype(self._X.dtype), metric="cos")
+            ).ravel()
+            scores = (1.0 - distances).astype(np.float32)
+        else:
+            scores = self._X @ q
+        k = min(limit, 100, len(scores))
+        if k == 0:
+            return [], []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        # Rounded distances/similarities for the whole hit list in two
+        # vectorized passes (cosine distance over normalized vectors)
+        top_scores = scores[top].astype(np.float64)
+        top_distances = np.round(1.0 - top_scores, 4).tolist()
+        top_similarities = np.round(top_scores * 100.0, 2).tolist()
+
         # Process results
         results = []
         context_texts = []
 
-        for i, (chunk_id, meta, doc_text, distance) in enumerate(zip(
-            results_data["ids"][0],
-            results_data["metadatas"][0],
-            results_data["documents"][0],
-            results_data["distances"][0]
-        )):
-            # Calculate similarity percentage
-            similarity = round((1 - distance) * 100, 2)
+        for idx, distance, similarity in zip(top, top_distances, top_similarities):
+            chunk_id = self._chunk_ids[idx]
+            meta = self._metas[idx]
+            # Several-KB chunk bodies only matter when a summary is wanted;
+            # a plain hit list serializes metadata only
+            doc_text = self._docs[idx] if include_summary else ""
 
             # Extract chunk index from chunk_id (format: "book_chunk_N")
-            chunk_index = int(chunk_id.split("_chunk_")[-1])
+            chunk_index = int(chunk_id.rpartition("_chunk_")[2])
 
             # Build result
             result = {
@@ -194,7 +740,7 @@ class SemanticSearcher:
                 "chunk_index": chunk_index,
                 "char_count": meta.get("char_count", 0),
                 "page_range": meta.get("page_range", ""),
-                "distance": round(distance, 4),
+                "distance": distance,
                 "similarity": similarity
             }
             results.append(result)
@@ -207,20 +753,70 @@ class SemanticSearcher:
                     f"[English: {meta.get('source_file', 'unknown')}{marathi_ref}{page_ref}]\n{doc_text}"
                 )
 
-        # Generate summary if requested
-        summary = None
-        if include_summary and context_texts:
-            try:
-                summary = self.generate_summary(query, context_texts)
-            except Exception as e:
-                summary = f"Error generating summary: {str(e)[:200]}"
+        return results, context_texts
 
-        return {
-            "query": query,
-            "results": results,
-            "total": len(results),
-            "summary": summary
+    def _build_summary_request(self, query: str, contexts: List[str]) -> Tuple[str, Dict]:
+        """Build the URL and body for the summary generateContent call."""
+        # Estimate input tokens (~4 chars per token) from the piece lengths,
+        # before materializing the prompt. Output is capped at 25% of input,
+        # minimum 4000 tokens to ensure complete summaries
+        prompt_len = (
+            len(_PROMPT_HEAD) + len(query) + len(_PROMPT_MID) + len(_PROMPT_TAIL)
+            + sum(map(len, contexts)) + len(_CONTEXT_SEP) * (len(contexts) - 1)
+        )
+        estimated_input_tokens = prompt_len // 4
+        output_tokens = max(4000, min(8192, int(estimated_input_tokens * 0.25)))
+
+        # Assemble the prompt in a single C-level concat
+        prompt = ''.join([
+            _PROMPT_HEAD, query, _PROMPT_MID, _CONTEXT_SEP.join(contexts), _PROMPT_TAIL
+        ])
+
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.SUMMARY_MODEL}:generateContent?key={self.api_key}"
+
+        body = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": 0.3,
+                "maxOutputTokens": output_tokens
+            }
         }
+        return url, body
+
+    @staticmethod
+    def _finish_note(finish_reason: str) -> str:
+        """Note appended when generation stopped for an abnormal reason."""
+        if finish_reason == "MAX_TOKENS":
+            return "\n\n[Note: Summary was truncated due to length limits]"
+        if finish_reason == "SAFETY":
+            return "\n\n[Note: Summary was stopped due to safety filters]"
+        if finish_reason not in ["STOP", "", "FINISH_REASON_STOP"]:
+            return f"\n\n[Note: Generation ended with reason: {finish_reason}]"
+        return ""
+
+    @staticmethod
+    def _parse_summary_response(result: Dict) -> str:
+        """Extract the summary text (and truncation notes) from a response."""
+        candidates = result.get("candidates", [])
+
+        if candidates:
+            candidate = candidates[0]
+            parts = candidate.get("content", {}).get("parts", [])
+            summary = "".join(p.get("text", "") for p in parts)
+
+            # Check if response was truncated
+            summary += SemanticSearcher._finish_note(candidate.get("finishReason", ""))
+
+            return summary.strip()
+
+        # Check for errors in response
+        error = result.get("error", {})
+        if error:
+            return f"API error: {error.get('message', 'Unknown error')}"
+
+        return "No summary generated (empty response)"
 
     def generate_summary(self, query: str, contexts: List[str]) -> str:
         """
@@ -236,88 +832,89 @@ class SemanticSearcher:
         if not contexts:
             return "No relevant documents found to summarize."
 
-        # Combine contexts
-        combined_context = "\n\n---\n\n".join(contexts)
-
-        # Create the prompt
-        prompt = f"""You are a historian analyzing historical documents about Marathi history (मराठा इतिहास).
-
-Based on the following retrieved document excerpts, provide a comprehensive and coherent summary answering the user's query.
-
-**Instructions:**
-1. Organize the information chronologically by dates/events when possible
-2. Include specific dates, names, and places mentioned in the sources
-3. Some information in the context will be in quotes or a part of a letter. In the output summary
-mention that this information is from a letter of quote by the author or speaker.
-4. If there are contradictions or uncertainties, note them
-5. Write in clear, flowing prose (not bullet points)
-6. If the context doesn't contain relevant information for the query, say so honestly
-7. Focus on accuracy - only include information found in the provided context
-8. If there are interesting factoids or trivia, include them in the output.
-9. If there is no matching information in the context, say so honestly and do not use any
-other external knowledge to answer the query.
-
-**User Query:** {query}
-
-**Retrieved Historical Documents:**
-{combined_context}
-
-**Summary (organized chronologically when dates are available):**"""
-
-        # Estimate input tokens (~4 chars per token) and set output to 25%
-        # Minimum 4000 tokens to ensure complete summaries
-        estimated_input_tokens = len(prompt) // 4
-        output_tokens = max(4000, min(8192, int(estimated_input_tokens * 0.25)))
-
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.SUMMARY_MODEL}:generateContent?key={self.api_key}"
-
-        body = {
-            "contents": [{
-                "parts": [{"text": prompt}]
-            }],
-            "generationConfig": {
-                "temperature": 0.3,
-                "maxOutputTokens": output_tokens
-            }
-        }
+        url, body = self._build_summary_request(query, contexts)
 
         try:
-            resp = requests.post(url, json=body, timeout=120)
+            resp = get_session().post(url, json=body, timeout=120)
 
             if resp.status_code != 200:
                 return f"Error generating summary: {resp.text[:200]}"
 
-            result = resp.json()
-            candidates = result.get("candidates", [])
+            return self._parse_summary_response(resp.json())
 
-            if candidates:
-                candidate = candidates[0]
-                parts = candidate.get("content", {}).get("parts", [])
-                summary = "".join(p.get("text", "") for p in parts)
+        except requests.Timeout:
+            return "Summary generation timed out after 120 seconds"
+        except Exception as e:
+            return f"Error generating summary: {str(e)[:200]}"
 
-                # Check if response was truncated
-                finish_reason = candidate.get("finishReason", "")
+    async def astream_summary(self, query: str, contexts: List[str]):
+        """
+        Stream summary text deltas from Gemini as they arrive.
 
-                if finish_reason == "MAX_TOKENS":
-                    summary += "\n\n[Note: Summary was truncated due to length limits]"
-                elif finish_reason == "SAFETY":
-                    summary += "\n\n[Note: Summary was stopped due to safety filters]"
-                elif finish_reason not in ["STOP", "", "FINISH_REASON_STOP"]:
-                    summary += f"\n\n[Note: Generation ended with reason: {finish_reason}]"
+        Uses the streamGenerateContent SSE endpoint so callers can start
+        rendering at roughly one-token latency instead of waiting for the
+        whole response.
 
-                return summary.strip()
+        Args:
+            query: Original user query
+            contexts: List of context strings with source references
 
-            # Check for errors in response
-            error = result.get("error", {})
-            if error:
-                return f"API error: {error.get('message', 'Unknown error')}"
+        Yields:
+            Text fragments of the summary, in order
+        """
+        if not contexts:
+            yield "No relevant documents found to summarize."
+            return
 
-            return "No summary generated (empty response)"
+        url, body = self._build_summary_request(query, contexts)
+        url = url.replace(":generateContent", ":streamGenerateContent") + "&alt=sse"
 
-        except requests.Timeout:
-            return "Summary generation timed out after 120 seconds"
+        finish_reason = ""
+        try:
+            async with get_async_client().stream("POST", url, json=body, timeout=120) as resp:
+                if resp.status_code != 200:
+                    detail = (await resp.aread()).decode("utf-8", "replace")
+                    yield f"Error generating summary: {detail[:200]}"
+                    return
+
+                async for line in resp.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    try:
+                        chunk = json.loads(line[5:])
+                    except ValueError:
+                        continue
+
+                    candidates = chunk.get("candidates", [])
+                    if not candidates:
+                        error = chunk.get("error", {})
+                        if error:
+                            yield f"API error: {error.get('message', 'Unknown error')}"
+                            return
+                        continue
+
+                    candidate = candidates[0]
+                    finish_reason = candidate.get("finishReason", finish_reason)
+                    for part in candidate.get("content", {}).get("parts", []):
+                        text = part.get("text", "")
+                        if text:
+                            yield text
+
+        except httpx.TimeoutException:
+            yield "Summary generation timed out after 120 seconds"
+            return
         except Exception as e:
-            return f"Error generating summary: {str(e)[:200]}"
+            yield f"Error generating summary: {str(e)[:200]}"
+            return
+
+        note = self._finish_note(finish_reason)
+        if note:
+            yield note
+
+    async def agenerate_summary(self, query: str, contexts: List[str]) -> str:
+        """Async variant of generate_summary, collected from the stream."""
+        pieces = [piece async for piece in self.astream_summary(query, contexts)]
+        return "".join(pieces).strip()
 
 
 # Singleton instance
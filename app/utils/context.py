@@ -5,13 +5,66 @@ Provides functionality to extract surrounding context (lines before/after)
 around search matches, including spanning across adjacent files.
 """
 
-import re
+import mmap
+import os
+from collections import namedtuple
+from collections.abc import Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
+
+# Try to import numba for the JIT-compiled line scan, with pure-Python fallback
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 CORPUS_DIR = Path(__file__).parent.parent.parent / "corpus"
 
+# Inverted line index built by scripts/build_line_index.py (optional)
+LINE_INDEX_PATH = Path(__file__).parent.parent.parent / "indexes" / "line_index.pkl"
+
+_line_index: Optional[dict] = None
+_line_index_loaded = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _first_match_kernel(blob, offsets, terms, term_bounds):  # pragma: no cover
+        """Return the first line index whose bytes contain any term, else -1."""
+        n_lines = offsets.shape[0] - 1
+        n_terms = term_bounds.shape[0] - 1
+        for li in range(n_lines):
+            line_start = offsets[li]
+            line_end = offsets[li + 1]
+            for ti in range(n_terms):
+                term_start = term_bounds[ti]
+                term_len = term_bounds[ti + 1] - term_start
+                if term_len == 0 or term_len > line_end - line_start:
+                    continue
+                for pos in range(line_start, line_end - term_len + 1):
+                    found = True
+                    for k in range(term_len):
+                        if blob[pos + k] != terms[term_start + k]:
+                            found = False
+                            break
+                    if found:
+                        return li
+        return -1
+
+
+def _lowered_blob(lines: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenate case-folded lines into one byte blob plus line offsets."""
+    encoded = [line.lower().encode('utf-8') for line in lines]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return blob, offsets
+
 
 def parse_filename(filename: str) -> tuple[str, int] | None:
     """
@@ -23,10 +76,14 @@ def parse_filename(filename: str) -> tuple[str, int] | None:
     Returns:
         Tuple of (book_prefix, page_number) or None if parsing fails
     """
-    match = re.match(r'^(.+)_page_(\d+)\.txt$', filename)
-    if match:
-        return match.group(1), int(match.group(2))
-    return None
+    # Plain string ops; the fixed "<book>_page_<n>.txt" shape doesn't need
+    # the regex engine on this per-result path
+    if not filename.endswith('.txt'):
+        return None
+    prefix, sep, page = filename[:-4].rpartition('_page_')
+    if not sep or not prefix or not page.isdigit():
+        return None
+    return prefix, int(page)
 
 
 def get_adjacent_filename(filename: str, offset: int) -> str | None:
@@ -53,31 +110,219 @@ def get_adjacent_filename(filename: str, offset: int) -> str | None:
     return f"{book_prefix}_page_{new_page:04d}.txt"
 
 
-def read_file_lines(filepath: Path) -> list[str]:
-    """Read a file and return its lines."""
+class _MappedLines:
+    """
+    Lazy line view over a memory-mapped corpus file.
+
+    Supports the len/index/slice/iterate operations the context code uses,
+    but a line is only decoded (and then memoized) when it is actually
+    touched — an index-hit context extraction decodes ~a dozen lines
+    instead of the whole file, with the OS page cache holding the bytes.
+    """
+
+    __slots__ = ("_mm", "_starts", "_ends", "_decoded")
+
+    def __init__(self, mm: mmap.mmap, starts: np.ndarray, ends: np.ndarray):
+        self._mm = mm
+        self._starts = starts
+        self._ends = ends
+        self._decoded: list[Optional[str]] = [None] * len(starts)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _decode(self, i: int) -> str:
+        line = self._decoded[i]
+        if line is None:
+            raw = self._mm[self._starts[i]:self._ends[i]]
+            if raw.endswith(b'\r'):
+                raw = raw[:-1]
+            line = raw.decode('utf-8')
+            self._decoded[i] = line
+        return line
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._decode(i) for i in range(*idx.indices(len(self._starts)))]
+        if idx < 0:
+            idx += len(self._starts)
+        return self._decode(idx)
+
+    def __iter__(self):
+        for i in range(len(self._starts)):
+            yield self._decode(i)
+
+
+def _line_bounds(mm: mmap.mmap) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized start/end byte offsets of each line in a mapped file."""
+    arr = np.frombuffer(mm, dtype=np.uint8)
+    newlines = np.flatnonzero(arr == 0x0A)
+
+    starts = np.empty(len(newlines) + 1, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = newlines + 1
+    ends = np.empty_like(starts)
+    ends[:-1] = newlines
+    ends[-1] = len(arr)
+
+    # Like str.splitlines, a trailing newline does not open a final empty line
+    if len(starts) > 1 and starts[-1] == len(arr):
+        starts = starts[:-1]
+        ends = ends[:-1]
+    return starts, ends
+
+
+# Cached representation of a corpus file: the (lazily decoded) lines plus
+# the case-folded blob/offsets consumed by the match kernel
+CachedFile = namedtuple("CachedFile", ["lines", "blob", "offsets"])
+
+_EMPTY_FILE = CachedFile([], None, None)
+
+
+@lru_cache(maxsize=2048)
+def _load_file(path_str: str, mtime_ns: int) -> CachedFile:
+    """
+    Memory-map a corpus file and index its line offsets, keyed by path + mtime.
+
+    Corpus files never change at runtime, so after warmup this removes the
+    repeated read/decode work that every search result used to pay; lines
+    decode on demand via _MappedLines.
+    """
+    try:
+        with open(path_str, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, IOError, ValueError):
+        # ValueError: cannot mmap an empty file
+        return _EMPTY_FILE
+
+    starts, ends = _line_bounds(mm)
+    lines = _MappedLines(mm, starts, ends)
+
+    if NUMBA_AVAILABLE and len(lines):
+        blob, offsets = _lowered_blob(lines)
+    else:
+        blob, offsets = None, None
+
+    return CachedFile(lines, blob, offsets)
+
+
+def _load_cached(filepath: Path) -> CachedFile:
+    """Get the cached representation of a file, or an empty one if missing."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return f.read().splitlines()
-    except (FileNotFoundError, IOError):
-        return []
+        mtime_ns = os.stat(filepath).st_mtime_ns
+    except OSError:
+        return _EMPTY_FILE
+    return _load_file(str(filepath), mtime_ns)
+
+
+def read_file_lines(filepath: Path) -> Sequence[str]:
+    """Read a file and return its lines (cached by path and mtime)."""
+    return _load_cached(filepath).lines
+
+
+def _get_line_index() -> Optional[dict]:
+    """Lazy-load the pickled inverted line index, once, if it exists."""
+    global _line_index, _line_index_loaded
+    if not _line_index_loaded:
+        _line_index_loaded = True
+        try:
+            import pickle
+            with open(LINE_INDEX_PATH, 'rb') as f:
+                saved = pickle.load(f)
+            saved["ids"] = {name: i for i, name in enumerate(saved["files"])}
+            _line_index = saved
+        except Exception:
+            _line_index = None
+    return _line_index
+
+
+def _lookup_line_index(filename: str, query_terms: list[str]) -> int | None:
+    """
+    Look up the first matching line via the inverted index.
+
+    Returns None when the index is missing or no whole-token posting hits.
+    A hit is only an upper bound on the first match: token postings cannot
+    see terms occurring as substrings of longer word forms on earlier
+    lines, so the caller still substring-scans up to the returned line.
+    """
+    index = _get_line_index()
+    if index is None:
+        return None
+
+    file_id = index["ids"].get(filename)
+    if file_id is None:
+        return None
+
+    best: int | None = None
+    postings = index["postings"]
+    for term in query_terms:
+        positions = postings.get(term.lower())
+        if positions is None:
+            continue
+        # Postings are sorted by file_id; binary-search the file's span
+        files_col = positions[:, 0]
+        lo = np.searchsorted(files_col, file_id, side='left')
+        hi = np.searchsorted(files_col, file_id, side='right')
+        if lo < hi:
+            line = int(positions[lo:hi, 1].min())
+            if best is None or line < best:
+                best = line
+
+    return best
+
+
+def _find_match(
+    lines: Sequence[str],
+    blob: np.ndarray | None,
+    offsets: np.ndarray | None,
+    query_terms: list[str],
+    stop: int | None = None
+) -> int | None:
+    """
+    Shared matching core over lines, optionally with a prebuilt blob.
+
+    With stop set, only lines[0:stop] are scanned - used when an index
+    lookup has already bounded where the first match can be.
+    """
+    if not lines or not query_terms:
+        return None
+    if stop is None or stop > len(lines):
+        stop = len(lines)
+
+    lowered_terms = [term.lower() for term in query_terms]
+
+    if NUMBA_AVAILABLE:
+        if blob is None:
+            blob, offsets = _lowered_blob(lines)
+        encoded_terms = [t.encode('utf-8') for t in lowered_terms]
+        term_bounds = np.zeros(len(encoded_terms) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in encoded_terms], out=term_bounds[1:])
+        terms = np.frombuffer(b''.join(encoded_terms), dtype=np.uint8)
+
+        idx = _first_match_kernel(blob, offsets[:stop + 1], terms, term_bounds)
+        return idx if idx >= 0 else None
+
+    # Pure-Python fallback: lowercase each line once, not once per term
+    for i in range(stop):
+        lowered = lines[i].lower()
+        for term in lowered_terms:
+            if term in lowered:
+                return i
+    return None
 
 
-def find_match_line(lines: list[str], query_terms: list[str]) -> int | None:
+def find_match_line(lines: Sequence[str], query_terms: list[str]) -> int | None:
     """
     Find the first line containing any of the query terms.
-    
+
     Args:
         lines: List of text lines
         query_terms: Terms to search for
-        
+
     Returns:
         Line index or None if not found
     """
-    for i, line in enumerate(lines):
-        for term in query_terms:
-            if term.lower() in line.lower():
-                return i
-    return None
+    return _find_match(lines, None, None, query_terms)
 
 
 def extract_context(
@@ -106,8 +351,9 @@ def extract_context(
         - lines_after: Lines included after match
     """
     filepath = corpus_dir / filename
-    current_lines = read_file_lines(filepath)
-    
+    cached = _load_cached(filepath)
+    current_lines = cached.lines
+
     if not current_lines:
         return {
             "content": "",
@@ -122,8 +368,20 @@ def extract_context(
     if not query_terms:
         query_terms = [query]
     
-    # Find the matching line
-    match_idx = find_match_line(current_lines, query_terms)
+    # Find the matching line. The inverted index returns the first
+    # whole-token hit, but a term can match as a substring of a longer
+    # word form on an earlier line, so the hit only bounds the substring
+    # scan from above - the scan runs over [0, hit] and wins ties
+    index_hit = _lookup_line_index(filename, query_terms)
+    if index_hit is not None and index_hit < len(current_lines):
+        match_idx = _find_match(
+            current_lines, cached.blob, cached.offsets, query_terms,
+            stop=index_hit + 1
+        )
+        if match_idx is None:
+            match_idx = index_hit
+    else:
+        match_idx = _find_match(current_lines, cached.blob, cached.offsets, query_terms)
     
     if match_idx is None:
         # If no match found, return the whole file
@@ -40,12 +40,19 @@ class MarathiNormalizer:
             # Anusvara/Chandrabindu equivalence (context-dependent)
             # '\u0901': '\u0902',  # Chandrabindu -> Anusvara (optional)
         }
-        
+
+        # Precomputed table so all mappings apply in a single C-level pass
+        self._translate_table = str.maketrans(self._char_mappings)
+
         # Regex for multiple spaces/whitespace normalization
         self._whitespace_re = re.compile(r'\s+')
         
         # Devanagari Unicode range for detection
         self._devanagari_re = re.compile(r'[\u0900-\u097F]')
+
+        # Complement of the characters extract_devanagari keeps, so the
+        # whole strip runs inside the C regex engine
+        self._non_devanagari_re = re.compile(r'[^\u0900-\u097F \t\n\u0964\u0965,.!?]+')
     
     def normalize(self, text: str) -> str:
         """
@@ -59,14 +66,19 @@ class MarathiNormalizer:
         """
         if not text:
             return text
-        
+
+        # Fast path for English queries: ASCII is already NFKC-normalized
+        # and untouched by the char mappings and the Indic normalizer, so
+        # only whitespace collapsing applies
+        if text.isascii():
+            return self._whitespace_re.sub(' ', text).strip()
+
         # Step 1: Unicode NFKC normalization
         # This standardizes composed/decomposed characters
         text = unicodedata.normalize("NFKC", text)
         
-        # Step 2: Apply character mappings for OCR robustness
-        for old_char, new_char in self._char_mappings.items():
-            text = text.replace(old_char, new_char)
+        # Step 2: Apply character mappings for OCR robustness in one pass
+        text = text.translate(self._translate_table)
         
         # Step 3: Indic-specific normalization (if available)
         if self._indic_normalizer is not None:
@@ -84,14 +96,17 @@ class MarathiNormalizer:
     def normalize_query(self, query: str) -> str:
         """
         Normalize a search query.
-        
+
+        Queries repeat heavily in a search UI, so this goes through the
+        cached normalize_text path.
+
         Args:
             query: Search query in English or Devanagari
-            
+
         Returns:
             Normalized query
         """
-        return self.normalize(query)
+        return normalize_text(query)
     
     def get_variants(self, text: str) -> list[str]:
         """
@@ -124,6 +139,21 @@ class MarathiNormalizer:
         
         return variants
     
+    def get_variants_bytes(self, text: str) -> list[bytes]:
+        """
+        Generate indexable variants pre-encoded as UTF-8 bytes.
+
+        Xapian re-encodes str arguments to UTF-8 on every call; handing it
+        bytes encoded once here skips that pass per variant per document.
+
+        Args:
+            text: Original text
+
+        Returns:
+            List of UTF-8 encoded text variants for indexing
+        """
+        return [variant.encode('utf-8') for variant in self.get_variants(text)]
+
     def is_devanagari(self, text: str) -> bool:
         """
         Check if text contains Devanagari characters.
@@ -148,14 +178,9 @@ class MarathiNormalizer:
         """
         if not text:
             return ""
-        
+
         # Keep Devanagari characters, spaces, and basic punctuation
-        result = []
-        for char in text:
-            if self._devanagari_re.match(char) or char in ' \t\n।॥,.!?':
-                result.append(char)
-        
-        return ''.join(result)
+        return self._non_devanagari_re.sub('', text)
 
 
 # Singleton instance for reuse
@@ -170,14 +195,17 @@ def get_normalizer() -> MarathiNormalizer:
     return _normalizer_instance
 
 
-@lru_cache(maxsize=1024)
+@lru_cache(maxsize=8192)
 def normalize_text(text: str) -> str:
     """
     Cached normalization function for frequent queries.
-    
+
+    lru_cache's C-level critical section makes this safe to call from the
+    FastAPI worker threadpool.
+
     Args:
         text: Text to normalize
-        
+
     Returns:
         Normalized text
     """
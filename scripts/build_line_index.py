@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Build an inverted line index over the corpus for fast context lookup.
+
+The index maps each whitespace token (case-folded) to the (file, line)
+positions where it occurs, letting app/utils/context.py find the matching
+line of a search result with a dictionary lookup instead of scanning the
+whole file. The corpus is static, so the index is built once and pickled.
+
+Usage:
+    python scripts/build_line_index.py [--corpus-dir ./corpus] [--index-dir ./indexes]
+"""
+
+import argparse
+import pickle
+import sys
+from pathlib import Path
+
+import numpy as np
+
+
+def build_line_index(corpus_dir: str, index_dir: str) -> dict:
+    """
+    Build and pickle the inverted line index.
+
+    Args:
+        corpus_dir: Path to directory containing text files
+        index_dir: Path to directory for the pickled index
+
+    Returns:
+        Dictionary with build statistics
+    """
+    corpus_path = Path(corpus_dir)
+    index_path = Path(index_dir)
+
+    if not corpus_path.exists():
+        raise FileNotFoundError(f"Corpus directory not found: {corpus_path}")
+
+    text_files = sorted(corpus_path.glob("*.txt"))
+    print(f"Found {len(text_files)} text files in {corpus_path}")
+
+    file_names = []
+    postings: dict[str, list[tuple[int, int]]] = {}
+
+    for file_id, file_path in enumerate(text_files):
+        file_names.append(file_path.name)
+        try:
+            lines = file_path.read_text(encoding='utf-8').splitlines()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  Error reading {file_path.name}: {e}")
+            continue
+
+        for line_no, line in enumerate(lines):
+            # Case-folded whitespace tokens, matching the runtime line scan
+            for token in set(line.lower().split()):
+                postings.setdefault(token, []).append((file_id, line_no))
+
+    # Store postings as int32 arrays, sorted by file_id (insertion order),
+    # so lookups can binary-search on the file column
+    packed = {
+        token: np.asarray(positions, dtype=np.int32)
+        for token, positions in postings.items()
+    }
+
+    index_path.mkdir(parents=True, exist_ok=True)
+    output_path = index_path / "line_index.pkl"
+    with open(output_path, 'wb') as f:
+        pickle.dump({"files": file_names, "postings": packed}, f)
+
+    stats = {
+        "files": len(file_names),
+        "terms": len(packed),
+        "postings": sum(len(p) for p in packed.values()),
+    }
+
+    print(f"\nLine index written to {output_path}")
+    print(f"  Files: {stats['files']}")
+    print(f"  Terms: {stats['terms']}")
+    print(f"  Postings: {stats['postings']}")
+
+    return stats
+
+
+def main():
+    """Main entry point for the line index builder."""
+    parser = argparse.ArgumentParser(
+        description="Build an inverted line index over the Marathi corpus"
+    )
+    parser.add_argument(
+        "--corpus-dir",
+        default="./corpus",
+        help="Directory containing text files (default: ./corpus)"
+    )
+    parser.add_argument(
+        "--index-dir",
+        default="./indexes",
+        help="Directory for the pickled index (default: ./indexes)"
+    )
+
+    args = parser.parse_args()
+
+    try:
+        build_line_index(args.corpus_dir, args.index_dir)
+        return 0
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,23 +9,43 @@ Example:
 """
 
 import argparse
+import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 
 def find_riyasat_folders(base_path: Path) -> list[Path]:
-    """Find all folders containing 'riyasat' in their name."""
+    """
+    Find all folders containing 'riyasat' in their name.
+
+    Walks the tree with os.scandir and only descends into directories, so
+    the (potentially huge number of) regular files under the data drive are
+    never stat'ed the way rglob("*") would.
+    """
     riyasat_folders = []
-    
-    for path in base_path.rglob("*"):
-        if path.is_dir() and "riyasat" in path.name.lower():
-            # Check if this folder has a 'text' subdirectory or contains .txt files
-            text_subdir = path / "text"
-            if text_subdir.exists():
-                riyasat_folders.append(text_subdir)
-            elif list(path.glob("*.txt")):
-                riyasat_folders.append(path)
-    
+
+    def walk(path: Path) -> None:
+        try:
+            entries = os.scandir(path)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                subdir = Path(entry.path)
+                if "riyasat" in entry.name.lower():
+                    # Check if this folder has a 'text' subdirectory or contains .txt files
+                    text_subdir = subdir / "text"
+                    if text_subdir.exists():
+                        riyasat_folders.append(text_subdir)
+                    elif next(subdir.glob("*.txt"), None) is not None:
+                        riyasat_folders.append(subdir)
+                walk(subdir)
+
+    walk(base_path)
     return riyasat_folders
 
 
@@ -50,6 +70,10 @@ def copy_files(source_folders: list[Path], dest_dir: Path, dry_run: bool = False
         "errors": 0
     }
     
+    # Pass 1: resolve all (source, dest, overwriting) pairs up front so the
+    # copy phase is a flat list of independent I/O jobs
+    pairs: list[tuple[Path, Path, bool]] = []
+
     for folder in source_folders:
         # Get the parent folder name (e.g., "marathi-riyasat-purvardha")
         # If we're in a "text" subfolder, go up one level
@@ -57,46 +81,65 @@ def copy_files(source_folders: list[Path], dest_dir: Path, dry_run: bool = False
             prefix = folder.parent.name
         else:
             prefix = folder.name
-        
+
         print(f"\nProcessing: {folder}")
         print(f"  Prefix: {prefix}")
-        
+
         txt_files = sorted(folder.glob("*.txt"))
         print(f"  Found {len(txt_files)} text files")
-        
+
         for txt_file in txt_files:
             stats["total"] += 1
-            
+
             # Create new filename: prefix_originalname.txt
             new_name = f"{prefix}_{txt_file.name}"
             dest_path = dest_dir / new_name
-            
-            if dest_path.exists() and not force:
+
+            file_exists = dest_path.exists()
+            if file_exists and not force:
                 print(f"  Skipping (exists): {new_name}")
                 stats["skipped"] += 1
                 continue
-            
-            try:
-                file_exists = dest_path.exists()
-                if dry_run:
-                    if file_exists:
-                        print(f"  Would overwrite: {txt_file.name} → {new_name}")
-                    else:
-                        print(f"  Would copy: {txt_file.name} → {new_name}")
+
+            if dry_run:
+                if file_exists:
+                    print(f"  Would overwrite: {txt_file.name} → {new_name}")
                 else:
-                    shutil.copy2(txt_file, dest_path)
-                    if file_exists and force:
-                        stats["overwritten"] += 1
-                        if stats["overwritten"] < 5 or stats["overwritten"] % 100 == 0:
-                            print(f"  Overwritten: {txt_file.name} → {new_name}")
-                    else:
-                        stats["copied"] += 1
-                        if stats["copied"] < 5 or stats["copied"] % 100 == 0:
-                            print(f"  Copied: {txt_file.name} → {new_name}")
-            except Exception as e:
-                print(f"  Error copying {txt_file.name}: {e}")
+                    print(f"  Would copy: {txt_file.name} → {new_name}")
+                continue
+
+            pairs.append((txt_file, dest_path, file_exists))
+
+    if dry_run or not pairs:
+        return stats
+
+    # Pass 2: copy in a thread pool. shutil.copy2 releases the GIL in its
+    # read/write/sendfile calls, so threads overlap the disk I/O.
+    stats_lock = threading.Lock()
+
+    def copy_one(src: Path, dst: Path, overwriting: bool) -> None:
+        try:
+            shutil.copy2(src, dst)
+        except Exception as e:
+            with stats_lock:
                 stats["errors"] += 1
-    
+            print(f"  Error copying {src.name}: {e}")
+            return
+
+        key = "overwritten" if overwriting else "copied"
+        with stats_lock:
+            stats[key] += 1
+            count = stats[key]
+        if count < 5 or count % 100 == 0:
+            verb = "Overwritten" if overwriting else "Copied"
+            print(f"  {verb}: {src.name} → {dst.name}")
+
+    max_workers = min(32, (os.cpu_count() or 4) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(copy_one, *pair) for pair in pairs]
+        for future in as_completed(futures):
+            future.result()
+
     return stats
 
 
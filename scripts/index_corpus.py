@@ -10,208 +10,562 @@ Usage:
 """
 
 import argparse
-import json
 import os
-import re
+import queue
+import struct
 import sys
+import threading
+import zlib
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+import orjson
 import xapian
 
 # Add the app directory to the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.utils.normalize import MarathiNormalizer, get_normalizer
+from app.utils.normalize import get_normalizer
+
+# Try to import tqdm for progress reporting, with a plain-counter fallback
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
 
 
 # Slot numbers for document values (used for sorting/filtering)
 SLOT_FILE_PATH = 0
 SLOT_PAGE_NUMBER = 1
+SLOT_CONTENT_PREVIEW = 2
+SLOT_MTIME = 3
+
+# Documents per explicit transaction; one journal/lock cycle per batch
+# instead of leaving flushing entirely to Xapian's internal heuristics
+BATCH_SIZE = 1000
+
+# Characters of content stored in the preview value slot
+PREVIEW_CHARS = 500
 
+# Sentinel telling the writer thread there is nothing left to write
+_WRITER_DONE = object()
 
-def extract_page_number(file_path: Path) -> int | None:
+# Document data layout: a version byte, this fixed header, then the
+# UTF-8 file path. Replaces the old JSON blob, which also duplicated the
+# full page content the corpus file already holds. The version byte can
+# never be '{' (0x7B), so readers can tell the packed form from legacy
+# JSON unambiguously - the header itself starts with doc_id, whose low
+# bytes can collide with any ASCII prefix
+_META_VERSION = b'\x01'
+_META_HEADER = struct.Struct('<IiI')  # doc_id, page_number (-1 = none), char_count
+
+
+@lru_cache(maxsize=4096)
+def _cached_variants(content: str) -> list[bytes]:
     """
-    Extract page number from filename.
-    
+    Memoized variant generation, keyed on the page text.
+
+    Scanned books repeat running heads, footers and boilerplate pages, so
+    identical content skips the normalization pass (per worker process).
+    Variants come back UTF-8 encoded, ready for TermGenerator.index_text.
+    """
+    return get_normalizer().get_variants_bytes(content)
+
+
+def iter_corpus_files(corpus_path: Path) -> Iterator[tuple[Path, float]]:
+    """
+    Yield (path, mtime) for non-empty .txt files as os.scandir finds them.
+
+    A generator rather than a sorted list: indexing can start on the first
+    file instead of after a full directory materialization. The mtime
+    comes from the same stat scandir already did, and drives the
+    incremental skip check.
+    """
+    for entry in os.scandir(corpus_path):
+        if entry.name.endswith(".txt"):
+            st = entry.stat()
+            if st.st_size > 0:
+                yield Path(entry.path), st.st_mtime
+
+
+def _existing_mtimes(db: xapian.WritableDatabase) -> dict[str, bytes]:
+    """
+    Map file_path -> serialized mtime for every document already indexed.
+
+    Comparing the serialized bytes directly sidesteps any float round-trip
+    concerns in the skip check.
+    """
+    existing: dict[str, bytes] = {}
+    # Every document posts on the empty term
+    for item in db.postlist(""):
+        try:
+            document = db.get_document(item.docid)
+            path = document.get_value(SLOT_FILE_PATH).decode('utf-8')
+            mtime_raw = document.get_value(SLOT_MTIME)
+            if path and mtime_raw:
+                existing[path] = mtime_raw
+        except Exception:
+            continue
+    return existing
+
+
+def extract_page_number(name: str) -> int | None:
+    """
+    Extract page number from a filename.
+
     Expects filenames like:
     - page_001.txt
     - 001.txt
     - book_page_42.txt
-    
+
     Args:
-        file_path: Path to the text file
-        
+        name: Filename (extension, if any, is ignored)
+
     Returns:
         Page number or None if not found
     """
-    filename = file_path.stem  # Get filename without extension
-    
-    # Try to find a number in the filename
-    numbers = re.findall(r'\d+', filename)
-    if numbers:
-        # Take the last number (most likely to be the page number)
-        return int(numbers[-1])
-    
-    return None
+    # Reverse scan for the last digit run before the extension (most
+    # likely to be the page number); plain string ops, no Path.stem
+    # allocation and no regex engine on this per-file path
+    dot = name.rfind('.')
+    end = len(name) if dot < 0 else dot
+    while end > 0 and not name[end - 1].isdigit():
+        end -= 1
+    if end == 0:
+        return None
 
+    start = end
+    while start > 0 and name[start - 1].isdigit():
+        start -= 1
 
-def index_document(
-    indexer: xapian.TermGenerator,
-    db: xapian.WritableDatabase,
+    return int(name[start:end])
+
+
+def prepare_document(
     file_path: Path,
-    normalizer: MarathiNormalizer,
-    doc_id: int
-) -> bool:
+    doc_id: int,
+    mtime: float
+) -> tuple[list[bytes], bytes, str, str, int | None, float] | None:
     """
-    Index a single document.
-    
+    Read and normalize a single file into everything the writer needs.
+
+    This half of the pipeline is pure CPU/IO and touches no Xapian
+    objects, so it can run in a worker process and pickle its result
+    back to the single writer. The metadata is packed here too, so the
+    full content never crosses the process boundary.
+
     Args:
-        indexer: Xapian TermGenerator
-        db: Xapian database
         file_path: Path to the text file
-        normalizer: MarathiNormalizer instance
         doc_id: Document ID for tracking
-        
+        mtime: File mtime captured at discovery, stored for incremental runs
+
     Returns:
-        True if indexing was successful
+        (variants, doc_data, fp_str, preview, page_num, mtime) tuple, or
+        None if the file was skipped or unreadable
     """
     try:
-        # Read the file content
-        content = file_path.read_text(encoding='utf-8')
-        
+        # Read the whole file with one raw os.read and decode once; skips
+        # the BufferedReader/TextIOWrapper layers (and their extra
+        # syscalls) that Path.read_text sets up per file
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            data = os.read(fd, size) if size else b''
+            # os.read may return short on some filesystems; top up if so
+            while len(data) < size:
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            os.close(fd)
+        content = data.decode('utf-8')
+
         if not content.strip():
             print(f"  Skipping empty file: {file_path}")
-            return False
-        
+            return None
+
         # Extract page number from filename
-        page_num = extract_page_number(file_path)
-        
-        # Create a new Xapian document
-        doc = xapian.Document()
-        
+        page_num = extract_page_number(file_path.name)
+
+        # Multiple variants for OCR robustness
+        variants = _cached_variants(content)
+
+        # Fixed-shape binary metadata instead of a JSON dict: the content
+        # itself stays in the corpus file (readers re-open it for display)
+        # and the preview lives in its value slot, so nothing variable-
+        # length but the path remains. os.fspath skips Path.__str__ and is
+        # the one stringification; the writer reuses it for every slot
+        fp_str = os.fspath(file_path)
+        doc_data = _META_VERSION + _META_HEADER.pack(
+            doc_id, -1 if page_num is None else page_num, len(content)
+        ) + fp_str.encode('utf-8')
+
+        return variants, doc_data, fp_str, content[:PREVIEW_CHARS], page_num, mtime
+
+    except Exception as e:
+        print(f"  Error preparing {file_path}: {e}")
+        return None
+
+
+def write_document(
+    indexer: xapian.TermGenerator,
+    db: xapian.WritableDatabase,
+    doc: xapian.Document,
+    prepared: tuple[list[bytes], bytes, str, str, int | None, float]
+) -> bool:
+    """
+    Apply one prepared document to the index.
+
+    Only this half performs Xapian mutations; the WritableDatabase is not
+    safe for concurrent writers, so it always runs on the main thread.
+
+    Args:
+        indexer: Xapian TermGenerator
+        db: Xapian database
+        doc: Reused Document instance (replace_document copies it into the DB)
+        prepared: Output of prepare_document
+
+    Returns:
+        True if indexing was successful
+    """
+    variants, doc_data, fp_str, preview, page_num, mtime = prepared
+
+    try:
+        # Reset the reused document rather than allocating a fresh SWIG
+        # proxy + C++ object per file
+        doc.clear_terms()
+        doc.clear_values()
+        doc.set_data(b'')
+
         # Set up the term generator for this document
         indexer.set_document(doc)
-        
-        # Index multiple variants for OCR robustness
-        variants = normalizer.get_variants(content)
-        for i, variant in enumerate(variants):
-            # Index with different weight prefixes for variants
-            # Original text gets higher weight
-            weight = 1 if i == 0 else 2
-            indexer.index_text(variant, weight)
-        
-        # Store metadata as JSON in document data
-        metadata = {
-            "file_path": str(file_path),
-            "page_number": page_num,
-            "content": content,  # Store full content for display
-            "content_preview": content[:500] if len(content) > 500 else content,
-            "char_count": len(content),
-            "doc_id": doc_id
-        }
-        doc.set_data(json.dumps(metadata, ensure_ascii=False))
-        
+
+        # Bind the SWIG proxy method once instead of re-resolving the
+        # attribute on every variant call
+        index_text = indexer.index_text
+
+        # Index with different weight prefixes for variants
+        # Original text gets higher weight
+        index_text(variants[0], 1)
+        for variant in variants[1:]:
+            index_text(variant, 2)
+
+        # Struct-packed metadata, already assembled in the worker; no
+        # serialization work left on the write path
+        doc.set_data(doc_data)
+
         # Store values for sorting/filtering
-        doc.add_value(SLOT_FILE_PATH, str(file_path))
+        doc.add_value(SLOT_FILE_PATH, fp_str)
         if page_num is not None:
             doc.add_value(SLOT_PAGE_NUMBER, xapian.sortable_serialise(page_num))
-        
-        # Add the document to the database
-        db.add_document(doc)
-        
+        # Raw preview for fuzzy reranking without a metadata parse at search time
+        doc.add_value(SLOT_CONTENT_PREVIEW, preview)
+        # Stored mtime lets incremental runs skip files that haven't changed
+        doc.add_value(SLOT_MTIME, xapian.sortable_serialise(mtime))
+
+        # Unique ID term: adds the document when new, replaces it in place
+        # when the file changed since the last run
+        id_term = 'Q' + fp_str
+        doc.add_boolean_term(id_term)
+        db.replace_document(id_term, doc)
+
         return True
-        
+
     except Exception as e:
-        print(f"  Error indexing {file_path}: {e}")
+        print(f"  Error indexing {fp_str}: {e}")
         return False
 
 
-def index_corpus(corpus_dir: str, index_dir: str, force_rebuild: bool = False) -> dict:
+def index_shard(
+    corpus_dir: str,
+    db_path: str,
+    shard_id: int,
+    num_shards: int,
+    force_rebuild: bool
+) -> dict:
+    """
+    Index this shard's slice of the corpus into its own database.
+
+    Runs in its own process: every shard worker owns one WritableDatabase
+    with its own lock and journal, so writes scale with the shard count
+    instead of serializing on a single writer. Files are assigned to
+    shards by a stable CRC32 of the file name (hash() is salted per
+    process and cannot be used here).
+
+    Args:
+        corpus_dir: Path to directory containing text files
+        db_path: Path of this shard's Xapian database
+        shard_id: Which slice of the corpus this worker owns
+        num_shards: Total number of shards
+        force_rebuild: If True, overwrite this shard's database
+
+    Returns:
+        Dictionary with this shard's indexing statistics
+    """
+    corpus_path = Path(corpus_dir)
+
+    db_mode = xapian.DB_CREATE_OR_OVERWRITE if force_rebuild else xapian.DB_CREATE_OR_OPEN
+    db = xapian.WritableDatabase(db_path, db_mode)
+
+    indexer = xapian.TermGenerator()
+    indexer.set_stemmer(xapian.Stem("none"))
+    doc = xapian.Document()
+
+    existing = {} if force_rebuild else _existing_mtimes(db)
+
+    stats = {"total": 0, "indexed": 0, "skipped": 0, "unchanged": 0, "errors": 0}
+    in_transaction = False
+    processed = 0
+
+    for doc_id, (file_path, mtime) in enumerate(iter_corpus_files(corpus_path)):
+        if zlib.crc32(file_path.name.encode('utf-8')) % num_shards != shard_id:
+            continue
+
+        stats["total"] += 1
+        if existing.get(os.fspath(file_path)) == xapian.sortable_serialise(mtime):
+            stats["unchanged"] += 1
+            continue
+
+        prepared = prepare_document(file_path, doc_id, mtime)
+
+        if processed % BATCH_SIZE == 0:
+            db.begin_transaction(False)
+            in_transaction = True
+
+        if prepared is not None and write_document(indexer, db, doc, prepared):
+            stats["indexed"] += 1
+        else:
+            stats["skipped"] += 1
+        processed += 1
+
+        if processed % BATCH_SIZE == 0:
+            db.commit_transaction()
+            in_transaction = False
+
+    if in_transaction:
+        db.commit_transaction()
+    db.commit()
+
+    stats["db_doc_count"] = db.get_doccount()
+    return stats
+
+
+def _print_summary(stats: dict) -> None:
+    """Print the final indexing statistics."""
+    print(f"\nIndexing complete!")
+    print(f"  Total files: {stats['total']}")
+    print(f"  Indexed: {stats['indexed']}")
+    print(f"  Unchanged: {stats['unchanged']}")
+    print(f"  Skipped: {stats['skipped']}")
+    print(f"  Documents in database: {stats['db_doc_count']}")
+
+
+def index_corpus(
+    corpus_dir: str,
+    index_dir: str,
+    force_rebuild: bool = False,
+    shards: int = 1
+) -> dict:
     """
     Index all text files in the corpus directory.
     
     Args:
         corpus_dir: Path to directory containing text files
         index_dir: Path to directory for Xapian index
-        force_rebuild: If True, delete existing index and rebuild
-        
+        force_rebuild: If True, overwrite the existing index
+        shards: Number of sub-databases written in parallel (1 = single DB)
+
     Returns:
         Dictionary with indexing statistics
     """
     corpus_path = Path(corpus_dir)
     index_path = Path(index_dir)
-    
+
     # Validate corpus directory
     if not corpus_path.exists():
         raise FileNotFoundError(f"Corpus directory not found: {corpus_path}")
-    
-    # Get list of text files
-    text_files = sorted(corpus_path.glob("*.txt"))
-    
-    if not text_files:
-        print(f"No .txt files found in {corpus_path}")
-        return {"total": 0, "indexed": 0, "skipped": 0, "errors": 0}
-    
-    print(f"Found {len(text_files)} text files in {corpus_path}")
-    
+
     # Create index directory if it doesn't exist
     index_path.mkdir(parents=True, exist_ok=True)
-    
+
+    manifest_path = index_path / "manifest.json"
+
+    if shards > 1:
+        # One worker process per shard; the manifest tells the search side
+        # which sub-databases to stitch together with add_database
+        shard_names = [f"xapian_db_shard_{k}" for k in range(shards)]
+        print(f"Indexing into {shards} shards...")
+
+        stats = {
+            "total": 0, "indexed": 0, "skipped": 0,
+            "unchanged": 0, "errors": 0, "db_doc_count": 0
+        }
+        with ProcessPoolExecutor(max_workers=shards) as executor:
+            futures = [
+                executor.submit(
+                    index_shard, corpus_dir, str(index_path / name),
+                    k, shards, force_rebuild
+                )
+                for k, name in enumerate(shard_names)
+            ]
+            for future in futures:
+                for key, value in future.result().items():
+                    stats[key] += value
+
+        manifest_path.write_bytes(orjson.dumps({"shards": shard_names}))
+        _print_summary(stats)
+        return stats
+
     # Handle existing index
     xapian_db_path = index_path / "xapian_db"
-    if xapian_db_path.exists():
-        if force_rebuild:
-            import shutil
-            print(f"Removing existing index at {xapian_db_path}")
-            shutil.rmtree(xapian_db_path)
-        else:
-            print(f"Index already exists at {xapian_db_path}")
-            print("Use --force to rebuild the index")
-    
-    # Create/open the Xapian database
-    db = xapian.WritableDatabase(str(xapian_db_path), xapian.DB_CREATE_OR_OPEN)
+    if xapian_db_path.exists() and not force_rebuild:
+        print(f"Index already exists at {xapian_db_path}")
+        print("Updating incrementally; use --force to rebuild from scratch")
+
+    # Keep Xapian's implicit flushing from firing mid-batch; the explicit
+    # transactions below decide when to commit
+    os.environ.setdefault('XAPIAN_FLUSH_THRESHOLD', '50000')
+
+    # Create/open the Xapian database. A forced rebuild overwrites the DB
+    # atomically rather than rmtree-ing and recreating the directory
+    db_mode = xapian.DB_CREATE_OR_OVERWRITE if force_rebuild else xapian.DB_CREATE_OR_OPEN
+    db = xapian.WritableDatabase(str(xapian_db_path), db_mode)
     
     # Set up the term generator
     indexer = xapian.TermGenerator()
     # Don't use stemming for Marathi - it doesn't have good support
     indexer.set_stemmer(xapian.Stem("none"))
+
+    # One Document reused for every file; write_document resets it
+    doc = xapian.Document()
     
-    # Get the normalizer
-    normalizer = get_normalizer()
-    
+    # Incremental mode: what is already indexed, and at which mtime.
+    # A forced rebuild starts from an overwritten (empty) database
+    existing = {} if force_rebuild else _existing_mtimes(db)
+    if existing:
+        print(f"Found {len(existing)} previously indexed documents")
+
     # Statistics
     stats = {
-        "total": len(text_files),
+        "total": 0,
         "indexed": 0,
         "skipped": 0,
+        "unchanged": 0,
         "errors": 0
     }
-    
+
     print("\nIndexing documents...")
-    
-    for i, file_path in enumerate(text_files):
-        if (i + 1) % 100 == 0 or i == 0:
-            print(f"  Processing {i + 1}/{len(text_files)}: {file_path.name}")
-        
-        success = index_document(indexer, db, file_path, normalizer, i)
-        
-        if success:
-            stats["indexed"] += 1
-        else:
-            stats["skipped"] += 1
-    
+
+    # Three-stage pipeline: worker processes read + normalize files in
+    # parallel, this thread streams discovery and collects results, and a
+    # dedicated writer thread owns every Xapian mutation. Xapian releases
+    # the GIL inside its write calls, so the writer genuinely overlaps
+    # with collecting the next prepared documents. Discovery feeds a
+    # bounded submission window, keeping memory O(window) rather than
+    # O(corpus); page order is stored per doc in its value slot, so
+    # on-disk discovery order is fine here.
+
+    # Progress: tqdm rate-limits its own redraws; the fallback is a plain
+    # counter on stderr, with no per-document f-string or Path formatting
+    progress = tqdm(unit="doc", mininterval=1.0) if TQDM_AVAILABLE else None
+
+    write_queue: queue.Queue = queue.Queue(maxsize=64)
+    writer_error: list[BaseException] = []
+
+    def drain_writes() -> None:
+        """Writer thread: applies prepared docs and manages transactions."""
+        processed = 0
+        in_transaction = False
+        done = False
+
+        try:
+            while True:
+                prepared = write_queue.get()
+                if prepared is _WRITER_DONE:
+                    done = True
+                    break
+
+                if processed % BATCH_SIZE == 0:
+                    # Unflushed transaction: the batch is committed (and
+                    # journaled) as one unit rather than per document
+                    db.begin_transaction(False)
+                    in_transaction = True
+
+                if prepared is not None and write_document(indexer, db, doc, prepared):
+                    stats["indexed"] += 1
+                else:
+                    stats["skipped"] += 1
+                processed += 1
+
+                if progress is not None:
+                    progress.update(1)
+                elif processed % 1000 == 0:
+                    sys.stderr.write(f"  {processed} documents processed\n")
+
+                if processed % BATCH_SIZE == 0:
+                    db.commit_transaction()
+                    in_transaction = False
+
+            if in_transaction:
+                db.commit_transaction()
+        except BaseException as e:
+            # A transaction call can raise here (disk full, DatabaseError).
+            # Record the failure but keep consuming until the sentinel, so
+            # the producer's bounded put() never blocks against a dead
+            # writer; the main thread re-raises after join()
+            writer_error.append(e)
+            while not done and write_queue.get() is not _WRITER_DONE:
+                pass
+
+    writer = threading.Thread(target=drain_writes, name="xapian-writer")
+    writer.start()
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        window = (os.cpu_count() or 2) * 4
+        pending: deque = deque()
+
+        for doc_id, (file_path, mtime) in enumerate(iter_corpus_files(corpus_path)):
+            stats["total"] += 1
+
+            # Unchanged since the last run: nothing to read or normalize
+            if existing.get(os.fspath(file_path)) == xapian.sortable_serialise(mtime):
+                stats["unchanged"] += 1
+                continue
+
+            pending.append(executor.submit(prepare_document, file_path, doc_id, mtime))
+            if len(pending) >= window:
+                write_queue.put(pending.popleft().result())
+
+        while pending:
+            write_queue.put(pending.popleft().result())
+
+    write_queue.put(_WRITER_DONE)
+    writer.join()
+
+    if progress is not None:
+        progress.close()
+
+    # Surface a writer failure instead of committing a half-written index
+    if writer_error:
+        raise writer_error[0]
+
+    if stats["total"] == 0:
+        print(f"No .txt files found in {corpus_path}")
+
     # Commit changes
     db.commit()
     
     # Get final document count
     stats["db_doc_count"] = db.get_doccount()
-    
-    print(f"\nIndexing complete!")
-    print(f"  Total files: {stats['total']}")
-    print(f"  Indexed: {stats['indexed']}")
-    print(f"  Skipped: {stats['skipped']}")
-    print(f"  Documents in database: {stats['db_doc_count']}")
-    
+
+    manifest_path.write_bytes(orjson.dumps({"shards": ["xapian_db"]}))
+    _print_summary(stats)
+
     return stats
 
 
@@ -235,11 +589,17 @@ def main():
         action="store_true",
         help="Force rebuild of existing index"
     )
-    
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Number of index shards written in parallel (default: 1)"
+    )
+
     args = parser.parse_args()
-    
+
     try:
-        stats = index_corpus(args.corpus_dir, args.index_dir, args.force)
+        stats = index_corpus(args.corpus_dir, args.index_dir, args.force, args.shards)
         return 0
     except Exception as e:
         print(f"Error: {e}")